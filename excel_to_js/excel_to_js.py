@@ -1,10 +1,16 @@
 import pandas as pd
+import numpy as np
+import openpyxl
+import xlsxwriter
 import json
 import os
 import logging
 import re
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
+from functools import lru_cache
 from pathlib import Path
+import importlib.util
+import sys
 
 # Configure logging
 logging.basicConfig(
@@ -13,6 +19,107 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# 键名中不允许出现的字符
+_KEY_SANITIZER = re.compile(r'[^\w\.]')
+
+@lru_cache(maxsize=None)
+def _validate_key_cached(key: str) -> str:
+    """
+    验证并修正键名，确保其符合 JavaScript 对象键名规范
+
+    相同的 class/key 会在各语言中重复出现，因此缓存结果
+    """
+    # 如果键名为空或只包含空白字符，使用默认键名
+    if not key or key.strip() == '':
+        return 'default_key'
+    
+    # 移除键名中的特殊字符
+    key = _KEY_SANITIZER.sub('_', key)
+    
+    # 确保键名不以数字开头
+    if key[0].isdigit():
+        key = 'k_' + key
+        
+    return key
+
+def _escape_js_string(s: Any) -> str:
+    """
+    处理字符串中的特殊字符
+
+    连续的 str.replace 在 C 层完成扫描，实测比 str.translate 快数倍
+    """
+    if not isinstance(s, str):
+        return str(s)
+    
+    # 处理单引号
+    s = s.replace("'", "\\'")
+    # 处理换行符
+    s = s.replace("\n", "\\n")
+    # 处理 HTML 中常见的 <br/> 标签
+    return s.replace("<br/>", "\\n")
+
+@lru_cache(maxsize=None)
+def _load_parse_js_file():
+    """
+    按文件路径加载 js_to_excel 中的 parse_js_file，复用其 JS 文件解析
+
+    仅在扫描时调用，避免其他操作在启动时导入 numba；不修改 sys.path。
+    模块需要登记到 sys.modules，numba 编译时按模块名查找全局变量。
+    """
+    module = sys.modules.get('js_to_excel')
+    if module is None:
+        path = Path(__file__).parent.parent / 'js_to_excel' / 'js_to_excel.py'
+        spec = importlib.util.spec_from_file_location('js_to_excel', path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules['js_to_excel'] = module
+        try:
+            spec.loader.exec_module(module)
+        except Exception:
+            del sys.modules['js_to_excel']
+            raise
+    return module.parse_js_file
+
+def _sheet_to_frame(rows) -> pd.DataFrame:
+    """
+    将 openpyxl 逐行读取的值转换为 DataFrame，表头处理参照 pd.read_excel
+
+    列宽取表头和所有数据行中最后一个非空单元格的最大位置，带格式的空单元格不会产生多余的列；
+    没有表头的列在有数据时命名为 Unnamed: <列号>，否则丢弃该列；
+    重复的列名依次重命名为 x.1、x.2。列名统一转换为字符串。完全空白的行会被跳过。
+    """
+    def used_width(row):
+        width = len(row)
+        while width and row[width - 1] is None:
+            width -= 1
+        return width
+    
+    header = list(next(rows, ()))
+    # 跳过完全空白的行
+    data = [row for row in rows if any(v is not None for v in row)]
+    width = max([used_width(header)] + [used_width(row) for row in data])
+    header = header[:width] + [None] * (width - len(header))
+    data = [tuple(row[:width]) + (None,) * (width - len(row)) for row in data]
+    
+    keep = [i for i, name in enumerate(header)
+            if name is not None or any(row[i] is not None for row in data)]
+    
+    # 与 pandas 的 dedup_names 相同，为重复的列名追加 .1、.2 后缀
+    columns = []
+    counts = {}
+    for i in keep:
+        name = str(header[i]) if header[i] is not None else f"Unnamed: {i}"
+        count = counts.get(name, 0)
+        while count > 0:
+            counts[name] = count + 1
+            name = f"{name}.{count}"
+            count = counts.get(name, 0)
+        counts[name] = count + 1
+        columns.append(name)
+    
+    if len(keep) != width:
+        data = [[row[i] for i in keep] for row in data]
+    return pd.DataFrame(data, columns=columns)
+
 class LocaleManager:
     def __init__(self, excel_path: str, locales_dir: str):
         """
@@ -25,6 +132,8 @@ class LocaleManager:
         self.excel_path = excel_path
         self.locales_dir = locales_dir
         self.df = None
+        # 待写入的新行，按 (class, key) 索引，统一在保存或生成前合并到 DataFrame
+        self._pending_rows: Dict[Tuple[str, str], Dict[str, Any]] = {}
         self.load_excel()
         
     def load_excel(self):
@@ -32,19 +141,54 @@ class LocaleManager:
         Load Excel file
         """
         try:
-            self.df = pd.read_excel(self.excel_path)
+            # 只读模式加载，跳过样式解析，只取单元格的值
+            wb = openpyxl.load_workbook(self.excel_path, read_only=True, data_only=True)
+            try:
+                # 与 pd.read_excel 一致读取第一个工作表，而不是保存时处于激活状态的工作表
+                ws = wb.worksheets[0]
+                # 只读模式依赖文件中的 <dimension> 标签，标签有误时会截断数据，先重置
+                ws.reset_dimensions()
+                self.df = _sheet_to_frame(ws.iter_rows(values_only=True))
+            finally:
+                wb.close()
             # Ensure required columns exist
             required_cols = ['class', 'key']
             missing_cols = [col for col in required_cols if col not in self.df.columns]
             if missing_cols:
                 raise ValueError(f"Excel file missing required columns: {', '.join(missing_cols)}")
             
+            self._build_index()
+            
             logger.info(f"Successfully loaded Excel file: {self.excel_path}")
             logger.info(f"Available languages: {[col for col in self.df.columns if col not in ['class', 'key']]}")
         except Exception as e:
             logger.error(f"Error loading Excel file: {str(e)}")
             raise
 
+    def _build_index(self):
+        """
+        建立 (class, key) -> 行位置 和 列名 -> 列位置 的映射，避免每次更新都扫描整列
+        """
+        self._idx: Dict[Tuple[Any, Any], List[int]] = {}
+        for i, row_key in enumerate(zip(self.df['class'].to_numpy(), self.df['key'].to_numpy())):
+            self._idx.setdefault(row_key, []).append(i)
+        self._col_pos: Dict[str, int] = {col: i for i, col in enumerate(self.df.columns)}
+    
+    def _add_locale_column(self, locale: str):
+        """
+        添加新的语言列并记录其列位置
+        """
+        self.df[locale] = None
+        self._col_pos[locale] = self.df.columns.get_loc(locale)
+    
+    def _set_value(self, positions: List[int], locale: str, value: Any):
+        """
+        按行位置写入指定语言的值
+        """
+        col = self._col_pos[locale]
+        for pos in positions:
+            self.df.iat[pos, col] = value
+
     def update_locale(self, class_name: str, key: str, locale: str, value: str):
         """
         Update value for specified locale
@@ -58,11 +202,15 @@ class LocaleManager:
         try:
             if locale not in self.df.columns:
                 logger.warning(f"Language {locale} does not exist, adding new column")
-                self.df[locale] = None
+                self._add_locale_column(locale)
             
-            mask = (self.df['class'] == class_name) & (self.df['key'] == key)
-            if not self.df[mask].empty:
-                self.df.loc[mask, locale] = value
+            positions = self._idx.get((class_name, key))
+            pending_row = self._pending_rows.get((class_name, key))
+            if positions:
+                self._set_value(positions, locale, value)
+                logger.info(f"Update successful: {class_name}.{key} -> {locale}: {value}")
+            elif pending_row is not None:
+                pending_row[locale] = value
                 logger.info(f"Update successful: {class_name}.{key} -> {locale}: {value}")
             else:
                 logger.warning(f"No match found: {class_name}.{key}, adding new row")
@@ -82,14 +230,23 @@ class LocaleManager:
         """
         try:
             # 检查是否已存在
-            mask = (self.df['class'] == class_name) & (self.df['key'] == key)
-            if not self.df[mask].empty:
+            positions = self._idx.get((class_name, key))
+            pending_row = self._pending_rows.get((class_name, key))
+            if positions:
                 logger.warning(f"条目已存在: {class_name}.{key}，将更新现有值")
                 # 更新现有行
                 for locale, value in values.items():
                     if locale not in self.df.columns:
-                        self.df[locale] = None
-                    self.df.loc[mask, locale] = value
+                        self._add_locale_column(locale)
+                    self._set_value(positions, locale, value)
+                logger.info(f"更新现有条目成功: {class_name}.{key}")
+            elif pending_row is not None:
+                logger.warning(f"条目已存在: {class_name}.{key}，将更新现有值")
+                # 更新尚未合并的新行
+                for locale, value in values.items():
+                    if locale not in self.df.columns:
+                        self._add_locale_column(locale)
+                    pending_row[locale] = value
                 logger.info(f"更新现有条目成功: {class_name}.{key}")
             else:
                 # 添加新行
@@ -97,21 +254,45 @@ class LocaleManager:
                 # 添加语言值
                 for locale, value in values.items():
                     if locale not in self.df.columns:
-                        self.df[locale] = None
+                        self._add_locale_column(locale)
                     new_row[locale] = value
                 
-                self.df = pd.concat([self.df, pd.DataFrame([new_row])], ignore_index=True)
+                # 先放入缓冲区，避免每次添加都复制整个 DataFrame
+                self._pending_rows[(class_name, key)] = new_row
                 logger.info(f"添加新条目成功: {class_name}.{key}")
         except Exception as e:
             logger.error(f"添加新条目时出错: {str(e)}")
             raise
+    
+    def _flush_pending_rows(self):
+        """
+        将缓冲区中的新行一次性合并到 DataFrame
+        """
+        if self._pending_rows:
+            start = len(self.df)
+            self.df = pd.concat([self.df, pd.DataFrame(list(self._pending_rows.values()))], ignore_index=True)
+            # 新行追加在末尾，依次记录其行位置
+            for i, row_key in enumerate(self._pending_rows, start):
+                self._idx[row_key] = [i]
+            self._pending_rows.clear()
             
     def save_to_excel(self):
         """
         保存更新后的数据到 Excel
         """
         try:
-            self.df.to_excel(self.excel_path, index=False)
+            self._flush_pending_rows()
+            # constant_memory 模式逐行写入并即时刷新到磁盘，字符串按原样保存
+            with xlsxwriter.Workbook(self.excel_path, {
+                'constant_memory': True,
+                'strings_to_numbers': False,
+                'strings_to_formulas': False,
+                'strings_to_urls': False,
+            }) as wb:
+                ws = wb.add_worksheet('Sheet1')
+                ws.write_row(0, 0, list(self.df.columns))
+                for i, row in enumerate(self.df.itertuples(index=False, name=None), 1):
+                    ws.write_row(i, 0, [None if v is None or v != v else v for v in row])
             logger.info(f"成功保存到 Excel: {self.excel_path}")
         except Exception as e:
             logger.error(f"保存 Excel 时出错: {str(e)}")
@@ -121,17 +302,7 @@ class LocaleManager:
         """
         处理字符串中的特殊字符
         """
-        if not isinstance(s, str):
-            return str(s)
-        
-        # 处理单引号
-        s = s.replace("'", "\\'")
-        # 处理换行符
-        s = s.replace("\n", "\\n")
-        # 处理 HTML 中常见的 <br/> 标签
-        s = s.replace("<br/>", "\\n")
-        
-        return s
+        return _escape_js_string(s)
     
     def _normalize_locale(self, locale: str) -> str:
         """
@@ -143,21 +314,36 @@ class LocaleManager:
         """
         验证并修正键名，确保其符合 JavaScript 对象键名规范
         """
-        # 如果键名为空或只包含空白字符，使用默认键名
-        if not key or key.strip() == '':
-            return 'default_key'
+        return _validate_key_cached(key)
+
+    def _validate_rows(self, locale_columns: List[str]) -> List[Optional[Tuple[str, str, Optional[List[str]]]]]:
+        """
+        为每一行计算验证后的 (class_name, key, parts)，parts 为嵌套 key 验证后的各部分
+
+        验证与语言无关，只对至少有一个翻译值的行计算；相同的 class/key 只验证一次。
+        没有翻译值的行对应 None。
+        """
+        classes = self.df['class'].tolist()
+        keys = self.df['key'].tolist()
+        rows = np.flatnonzero(pd.notna(self.df[locale_columns].to_numpy()).any(axis=1)).tolist()
         
-        # 移除键名中的特殊字符
-        key = re.sub(r'[^\w\.]', '_', key)
+        class_map = {c: _validate_key_cached(c) for c in {classes[i] for i in rows}}
+        key_map = {}
+        for raw_key in {keys[i] for i in rows}:
+            key = _validate_key_cached(raw_key)
+            # 处理嵌套 key，验证每个部分
+            parts = [_validate_key_cached(part) for part in key.split('.')] if '.' in key else None
+            key_map[raw_key] = (key, parts)
         
-        # 确保键名不以数字开头
-        if key[0].isdigit():
-            key = 'k_' + key
-            
-        return key
+        validated = [None] * len(self.df)
+        for i in rows:
+            validated[i] = (class_map[classes[i]], *key_map[keys[i]])
+        return validated
 
     def generate_js_files(self):
         try:
+            self._flush_pending_rows()
+            
             # 获取所有语言列
             locale_columns = [col for col in self.df.columns if col not in ['class', 'key']]
             
@@ -168,33 +354,27 @@ class LocaleManager:
             # 确保目录存在
             os.makedirs(self.locales_dir, exist_ok=True)
             
+            validated = self._validate_rows(locale_columns)
+            
             for locale in locale_columns:
                 normalized_locale = self._normalize_locale(locale)
                 locale_dict = {}
+                # 纯 Python 列表访问，避免在内层循环中经过 pandas/NumPy
+                vals = self.df[locale].tolist()
                 
-                for _, row in self.df.iterrows():
-                    class_name = row['class']
-                    key = row['key']
-                    value = row.get(locale)
-                    
-                    if pd.isna(value):
+                for row_keys, value in zip(validated, vals):
+                    # value != value 用于判断 NaN
+                    if value is None or value != value:
                         continue
-                    
-                    # 验证并修正 class_name 和 key
-                    class_name = self._validate_key(class_name)
-                    key = self._validate_key(key)
+                    class_name, key, parts = row_keys
                     
                     if class_name not in locale_dict:
                         locale_dict[class_name] = {}
                     
                     # 处理嵌套 key
-                    if '.' in key:
-                        parts = key.split('.')
-                        # 验证每个部分
-                        parts = [self._validate_key(part) for part in parts]
-                        
+                    if parts is not None:
                         current_dict = locale_dict[class_name]
-                        for i, part in enumerate(parts[:-1]):
+                        for part in parts[:-1]:
                             if part not in current_dict:
                                 current_dict[part] = {}
                             # 确保当前节点是字典类型
@@ -205,18 +385,17 @@ class LocaleManager:
                             current_dict = current_dict[part]
                         
                         # 设置最终值
-                        current_dict[parts[-1]] = self._escape_string(value)
+                        current_dict[parts[-1]] = _escape_js_string(value)
                     else:
                         # 检查是否已存在同名的嵌套对象
                         if key in locale_dict[class_name] and isinstance(locale_dict[class_name][key], dict):
                             # 如果已存在同名的嵌套对象，将值存储在特殊键下
-                            locale_dict[class_name][key]['_value'] = self._escape_string(value)
+                            locale_dict[class_name][key]['_value'] = _escape_js_string(value)
                         else:
-                            locale_dict[class_name][key] = self._escape_string(value)
+                            locale_dict[class_name][key] = _escape_js_string(value)
                 
-                # 修改 JS 内容生成逻辑
-                def generate_nested_content(data, indent=0):
-                    content = ""
+                # 修改 JS 内容生成逻辑，直接写入文件对象
+                def write_nested(f, data, indent=0):
                     indent_str = "  " * indent
                     
                     for key, value in data.items():
@@ -224,39 +403,54 @@ class LocaleManager:
                             # 检查是否有特殊的 _value 键
                             if '_value' in value:
                                 special_value = value.pop('_value')
-                                content += f"{indent_str}{key}: '{special_value}',\n"
+                                f.write(f"{indent_str}{key}: '{special_value}',\n")
                                 if value:  # 如果还有其他键
-                                    content += f"{indent_str}{key}_nested: {{\n"
-                                    content += generate_nested_content(value, indent + 1)
-                                    content += f"{indent_str}}},\n"
+                                    f.write(f"{indent_str}{key}_nested: {{\n")
+                                    write_nested(f, value, indent + 1)
+                                    f.write(f"{indent_str}}},\n")
                             else:
-                                content += f"{indent_str}{key}: {{\n"
-                                content += generate_nested_content(value, indent + 1)
-                                content += f"{indent_str}}},\n"
+                                f.write(f"{indent_str}{key}: {{\n")
+                                write_nested(f, value, indent + 1)
+                                f.write(f"{indent_str}}},\n")
                         else:
-                            content += f"{indent_str}{key}: '{value}',\n"
-                    return content
+                            f.write(f"{indent_str}{key}: '{value}',\n")
                 
-                # 生成 JS 格式的内容
-                js_content = "export default {\n"
-                for class_name, class_dict in locale_dict.items():
-                    js_content += f"  {class_name}: {{\n"
-                    js_content += generate_nested_content(class_dict, 2)
-                    js_content += "  },\n"
-                js_content += "};"
-                
-                # 保存 JS 文件
+                # 生成 JS 格式的内容并保存，使用 1 MiB 缓冲减少系统调用
                 output_path = os.path.join(self.locales_dir, f"{normalized_locale}.js")
-                with open(output_path, 'w', encoding='utf-8') as f:
-                    f.write(js_content)
+                with open(output_path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+                    f.write("export default {\n")
+                    for class_name, class_dict in locale_dict.items():
+                        f.write(f"  {class_name}: {{\n")
+                        write_nested(f, class_dict, 2)
+                        f.write("  },\n")
+                    f.write("};")
                 logger.info(f"成功生成语言文件: {output_path}")
                 
         except Exception as e:
             logger.error(f"生成 JS 文件时出错: {str(e)}")
             raise
 
+    def _lookup_js_value(self, locale_data: Dict, class_name: str, parts: List[str]) -> Any:
+        """
+        在解析后的 JS 字典中按 generate_js_files 的写入规则查找验证后的 class_name 和 key 各部分对应的值
+        """
+        node = locale_data.get(class_name)
+        for part in parts[:-1]:
+            if not isinstance(node, dict):
+                return None
+            child = node.get(part)
+            # 同名的值和嵌套对象同时存在时，嵌套对象写在 <key>_nested 下
+            if not isinstance(child, dict):
+                child = node.get(f"{part}_nested")
+            node = child
+        if not isinstance(node, dict):
+            return None
+        return node.get(parts[-1])
+
     def scan_and_update(self):
         try:
+            self._flush_pending_rows()
+            
             # 获取所有语言列
             locale_columns = [col for col in self.df.columns if col not in ['class', 'key']]
             
@@ -270,21 +464,41 @@ class LocaleManager:
             # 记录需要更新的内容
             updates = []
             
-            for _, row in self.df.iterrows():
-                class_name = row['class']
-                key = row['key']
+            # 每个语言文件只读取并解析一次，不存在的文件记为 None
+            parse_js_file = _load_parse_js_file()
+            existing = {}
+            for locale in locale_columns:
+                js_file = os.path.join(self.locales_dir, f"{self._normalize_locale(locale)}.js")
+                if not os.path.exists(js_file):
+                    existing[locale] = None
+                    continue
+                try:
+                    existing[locale] = parse_js_file(js_file)
+                except ValueError as e:
+                    logger.warning(f"无法解析 {js_file}，将重新生成: {str(e)}")
+                    existing[locale] = {}
+            
+            # 按列转换为纯 Python 列表，避免在内层循环中经过 pandas
+            classes = self.df['class'].tolist()
+            keys = self.df['key'].tolist()
+            per_locale = [(locale, self.df[locale].tolist()) for locale in locale_columns]
+            validated = self._validate_rows(locale_columns)
+            
+            for i, row_keys in enumerate(validated):
+                if row_keys is None:
+                    continue
+                class_name = classes[i]
+                key = keys[i]
                 
-                for locale in locale_columns:
-                    value = row.get(locale)
-                    if pd.isna(value):
+                for locale, vals in per_locale:
+                    value = vals[i]
+                    # value != value 用于判断 NaN
+                    if value is None or value != value:
                         continue
-                        
-                    # 标准化语言代码
-                    normalized_locale = self._normalize_locale(locale)
                     
                     # 检查是否需要更新
-                    js_file = os.path.join(self.locales_dir, f"{normalized_locale}.js")
-                    if not os.path.exists(js_file):
+                    locale_data = existing[locale]
+                    if locale_data is None:
                         updates.append({
                             'class': class_name,
                             'key': key,
@@ -294,18 +508,10 @@ class LocaleManager:
                         })
                         continue
                     
-                    # 读取现有的 JS 文件内容
-                    with open(js_file, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                    
-                    # 检查是否需要更新
-                    if '.' in key:
-                        parts = key.split('.')
-                        pattern = rf"{class_name}:\s*{{\s*{parts[0]}:\s*{{\s*{parts[1]}:\s*'[^']*'"
-                    else:
-                        pattern = rf"{class_name}:\s*{{\s*{key}:\s*'[^']*'"
-                    
-                    if not re.search(pattern, content):
+                    # 与 JS 文件中的现有值比较
+                    class_v, key_v, parts = row_keys
+                    current = self._lookup_js_value(locale_data, class_v, parts or [key_v])
+                    if current is None or _escape_js_string(current) != _escape_js_string(value):
                         updates.append({
                             'class': class_name,
                             'key': key,
@@ -339,7 +545,6 @@ class LocaleManager:
             raise
 
 def main():
-    import sys
     import argparse
     
     script_dir = Path(__file__).parent.absolute()
@@ -6,6 +6,15 @@ import re
 from typing import Dict, List, Tuple
 from pathlib import Path
 
+import numpy as np
+
+try:
+    # 可选依赖：安装 numba 后使用 JIT 编译的词法扫描
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
 # 配置日志
 logging.basicConfig(
     level=logging.INFO,
@@ -13,84 +22,227 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# 词法单元类型
+_TOK_IDENT = 0    # 标识符或裸字面量，如 text、true、5
+_TOK_STRING = 1   # 字符串内容（不含引号）
+_TOK_OPEN = 2     # {
+_TOK_CLOSE = 3    # }
+_TOK_COLON = 4    # :
+
+# 字符串中的转义序列
+_ESCAPE_PATTERN = re.compile(r'\\(.)', re.S)
+_ESCAPE_CHARS = {'n': '\n', 't': '\t', 'r': '\r'}
+
+def _is_ident_char(ch: str) -> bool:
+    """
+    Identifier character test, kept in sync with _is_ident_byte: ASCII letters,
+    digits and _ $ . - +, plus every non-ASCII character
+    """
+    return ch >= '\x80' or ch.isalnum() or ch in '_$.-+'
+
+def _tokenize_js(content: str) -> List[Tuple[int, int, int]]:
+    """
+    Scan JS object source in a single pass and return (kind, start, end) tokens
+
+    Tracks quote and comment state while scanning so braces and colons inside
+    strings or comments are ignored. Commas, semicolons and other punctuation
+    are skipped.
+    """
+    tokens = []
+    n = len(content)
+    i = 0
+    while i < n:
+        ch = content[i]
+        if ch in '\'"`':
+            # 字符串，跳过转义字符直到匹配的引号
+            start = i + 1
+            i = start
+            while i < n and content[i] != ch:
+                i += 2 if content[i] == '\\' else 1
+            if i >= n:
+                raise ValueError(f"Unterminated string starting at offset {start - 1}")
+            tokens.append((_TOK_STRING, start, i))
+            i += 1
+        elif ch == '/' and content.startswith('//', i):
+            # 单行注释
+            end = content.find('\n', i)
+            i = n if end == -1 else end + 1
+        elif ch == '/' and content.startswith('/*', i):
+            # 多行注释
+            end = content.find('*/', i + 2)
+            i = n if end == -1 else end + 2
+        elif ch == '{':
+            tokens.append((_TOK_OPEN, i, i + 1))
+            i += 1
+        elif ch == '}':
+            tokens.append((_TOK_CLOSE, i, i + 1))
+            i += 1
+        elif ch == ':':
+            tokens.append((_TOK_COLON, i, i + 1))
+            i += 1
+        elif _is_ident_char(ch):
+            start = i
+            while i < n and _is_ident_char(content[i]):
+                i += 1
+            tokens.append((_TOK_IDENT, start, i))
+        else:
+            i += 1
+    return tokens
+
+if HAS_NUMBA:
+    @njit(cache=True)
+    def _is_ident_byte(ch):
+        # 字母、数字、_ $ . - + 以及非 ASCII 字节
+        return ((48 <= ch <= 57) or (65 <= ch <= 90) or (97 <= ch <= 122)
+                or ch == 95 or ch == 36 or ch == 46 or ch == 45 or ch == 43 or ch >= 128)
+
+    @njit(cache=True)
+    def _push_token(tokens, count, kind, start, end):
+        # 缓冲区已满时容量翻倍
+        if count == tokens.shape[0]:
+            grown = np.empty((tokens.shape[0] * 2, 3), dtype=np.int32)
+            grown[:count] = tokens
+            tokens = grown
+        tokens[count, 0] = kind
+        tokens[count, 1] = start
+        tokens[count, 2] = end
+        return tokens
+
+    @njit(cache=True)
+    def _scan_js_bytes(buf):
+        """
+        JIT-compiled equivalent of _tokenize_js over the UTF-8 bytes of a file
+
+        Returns an int32 array of shape (count, 3) whose rows are
+        (kind, start, end) byte offsets. The buffer starts at about one token
+        per 8 input bytes and doubles when full, so scratch memory stays a
+        small multiple of the token count. Bytes >= 0x80 are treated as
+        identifier characters, matching _is_ident_char for non-ASCII
+        characters; this is safe because UTF-8 multi-byte sequences never
+        contain ASCII punctuation.
+        """
+        n = buf.shape[0]
+        tokens = np.empty((n // 8 + 16, 3), dtype=np.int32)
+        count = 0
+        i = 0
+        while i < n:
+            ch = buf[i]
+            if ch == 39 or ch == 34 or ch == 96:  # ' " `
+                start = i + 1
+                i = start
+                while i < n and buf[i] != ch:
+                    if buf[i] == 92:  # \\
+                        i += 2
+                    else:
+                        i += 1
+                if i >= n:
+                    raise ValueError("Unterminated string")
+                tokens = _push_token(tokens, count, _TOK_STRING, start, i)
+                count += 1
+                i += 1
+            elif ch == 47 and i + 1 < n and buf[i + 1] == 47:  # //
+                i += 2
+                while i < n and buf[i] != 10:
+                    i += 1
+                i += 1
+            elif ch == 47 and i + 1 < n and buf[i + 1] == 42:  # /*
+                i += 2
+                while i + 1 < n and not (buf[i] == 42 and buf[i + 1] == 47):
+                    i += 1
+                i += 2
+            elif ch == 123 or ch == 125 or ch == 58:  # { } :
+                if ch == 123:
+                    kind = _TOK_OPEN
+                elif ch == 125:
+                    kind = _TOK_CLOSE
+                else:
+                    kind = _TOK_COLON
+                tokens = _push_token(tokens, count, kind, i, i + 1)
+                count += 1
+                i += 1
+            elif _is_ident_byte(ch):
+                start = i
+                while i < n and _is_ident_byte(buf[i]):
+                    i += 1
+                tokens = _push_token(tokens, count, _TOK_IDENT, start, i)
+                count += 1
+            else:
+                i += 1
+        return tokens[:count]
+
+def _unescape(value: str) -> str:
+    """
+    Resolve JS escape sequences such as \\' and \\n in a string literal
+    """
+    if '\\' not in value:
+        return value
+    return _ESCAPE_PATTERN.sub(lambda m: _ESCAPE_CHARS.get(m.group(1), m.group(1)), value)
+
 def parse_js_file(file_path: str) -> Dict:
     """
     Parse JS file and return a dictionary
     """
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-            
-            # 移除 export default 和分号
-            content = content.replace('export default', '')
-            
-            # 处理注释 (单行注释)
-            content = re.sub(r'//.*?\n', '\n', content)
-            
-            # 移除末尾的分号
-            content = content.strip()
-            if content.endswith(';'):
-                content = content[:-1]
-            
-            # 创建最终结果字典
-            result = {}
-            
-            # 基本方法：手动提取嵌套对象
-            # 匹配顶级对象，如 text: {...}, tip: {...} 等
-            top_level_pattern = r'(\w+)\s*:\s*{([^{}]|(?R))*}'
-            
-            # 获取所有顶级匹配
-            current_pos = 0
-            while current_pos < len(content):
-                # 查找下一个顶级键名
-                match = re.search(r'(\w+)\s*:', content[current_pos:])
-                if not match:
-                    break
-                    
-                key = match.group(1)
-                start_pos = current_pos + match.end()
-                
-                # 跳过冒号和空白
-                while start_pos < len(content) and content[start_pos] != '{':
-                    start_pos += 1
-                    
-                if start_pos >= len(content):
-                    break
-                    
-                # 找到对应的闭合大括号
-                bracket_count = 1
-                end_pos = start_pos + 1
-                
-                while end_pos < len(content) and bracket_count > 0:
-                    if content[end_pos] == '{':
-                        bracket_count += 1
-                    elif content[end_pos] == '}':
-                        bracket_count -= 1
-                    end_pos += 1
-                
-                if bracket_count != 0:
-                    raise ValueError(f"Cannot find closing bracket for class {key}")
-                
-                # 提取类内容 (不包括外层的大括号)
-                class_content = content[start_pos+1:end_pos-1].strip()
-                
-                # 解析类内容
-                class_dict = {}
-                
-                # 解析类中的所有键值对
-                item_pattern = r'([^,{}]+?)\s*:\s*[\'"]([^\'"]*)[\'"],?'
-                items = re.finditer(item_pattern, class_content)
-                
-                for item in items:
-                    item_key = item.group(1).strip()
-                    item_value = item.group(2)
-                    class_dict[item_key] = item_value
-                
-                result[key] = class_dict
-                current_pos = end_pos
+        raw = None
+        if HAS_NUMBA:
+            with open(file_path, 'rb') as f:
+                raw = f.read()
+        # 偏移量以 int32 保存，超过 2 GiB 的文件使用纯 Python 扫描
+        if raw is not None and len(raw) < 2 ** 31:
+            tokens = _scan_js_bytes(np.frombuffer(raw, dtype=np.uint8)).tolist()
+            # 只把需要的片段解码为 str
+            text = lambda start, end: raw[start:end].decode('utf-8')
+        else:
+            content = raw.decode('utf-8') if raw is not None else Path(file_path).read_text(encoding='utf-8')
+            tokens = _tokenize_js(content)
+            text = lambda start, end: content[start:end]
+        
+        # 创建最终结果字典，嵌套对象保留为嵌套字典
+        result = {}
+        stack = []
+        key = None
+        pending_key = None
+        
+        for kind, start, end in tokens:
+            if kind == _TOK_IDENT:
+                # 非 ASCII 字符被当作标识符的一部分，去掉其中的 Unicode 空白（如 \u00a0、\u3000）
+                ident = text(start, end).strip()
+                if not ident:
+                    continue
             
-            logger.info(f"Successfully parsed file: {file_path}, found {len(result)} top-level categories")
-            return result
+            if kind == _TOK_OPEN:
+                if not stack:
+                    # export default 后的最外层对象
+                    stack.append(result)
+                elif pending_key is not None:
+                    child = {}
+                    stack[-1][pending_key] = child
+                    stack.append(child)
+                    pending_key = None
+                else:
+                    raise ValueError(f"Unexpected '{{' at offset {start}")
+            elif kind == _TOK_CLOSE:
+                if not stack:
+                    raise ValueError(f"Unexpected '}}' at offset {start}")
+                stack.pop()
+                key = pending_key = None
+            elif kind == _TOK_COLON:
+                pending_key = key
+                key = None
+            elif pending_key is not None:
+                # 值位置：只保留字符串值，跳过 true、数字等裸字面量
+                if kind == _TOK_STRING and stack:
+                    stack[-1][pending_key] = _unescape(text(start, end))
+                pending_key = None
+            else:
+                # 键位置：标识符或带引号的键名
+                key = ident if kind == _TOK_IDENT else text(start, end)
+        
+        if stack:
+            raise ValueError("Cannot find closing bracket for top-level object")
+        
+        logger.info(f"Successfully parsed file: {file_path}, found {len(result)} top-level categories")
+        return result
                 
     except Exception as e:
         logger.error(f"Error parsing file {file_path}: {str(e)}")
@@ -99,32 +251,29 @@ def parse_js_file(file_path: str) -> Dict:
 def flatten_dict(d: Dict, parent_key: str = '', sep: str = '.') -> List[Tuple[str, str, str, int]]:
     """
     Flatten nested dictionary into a list while maintaining original order
+
+    Returns (class, key, value, order) tuples where nested keys of any depth
+    are joined with sep and order increases monotonically. The input is not
+    modified.
     """
     items = []
-    # 移除特殊键 __order__
-    order_keys = d.pop('__order__', list(d.keys()))
-    
-    # 按照原始顺序遍历
-    for idx, k in enumerate(order_keys):
-        if k not in d:
+    order = 0
+    for class_name, sub in d.items():
+        if not isinstance(sub, dict):
+            # 顶级的非对象值
+            items.append((parent_key, class_name, sub, order))
+            order += 1
             continue
-        v = d[k]
-        class_name = k
-        if isinstance(v, dict):
-            # 记录子键的顺序
-            sub_keys = list(v.keys())
-            for sub_idx, sub_k in enumerate(sub_keys):
-                sub_v = v[sub_k]
-                if isinstance(sub_v, dict):
-                    # 如果还有更深层次的嵌套，继续展平
-                    subsub_keys = list(sub_v.keys())
-                    for subsub_idx, subsub_k in enumerate(subsub_keys):
-                        subsub_v = sub_v[subsub_k]
-                        items.append((class_name, f"{sub_k}.{subsub_k}", subsub_v, idx*10000 + sub_idx*100 + subsub_idx))
-                else:
-                    items.append((class_name, sub_k, sub_v, idx*10000 + sub_idx))
-        else:
-            items.append((parent_key, k, v, idx))
+        
+        # 使用显式栈做深度优先遍历，逆序入栈以保持原始顺序
+        stack = [(v, [k]) for k, v in reversed(list(sub.items()))]
+        while stack:
+            node, path = stack.pop()
+            if isinstance(node, dict):
+                stack.extend((v, path + [k]) for k, v in reversed(list(node.items())))
+            else:
+                items.append((class_name, sep.join(path), node, order))
+                order += 1
     return items
 
 def js_to_excel(js_files: Dict[str, str], output_excel_path: str):
@@ -132,10 +281,6 @@ def js_to_excel(js_files: Dict[str, str], output_excel_path: str):
     Convert multiple JS language files to Excel spreadsheet
     """
     try:
-        # Create base DataFrame
-        all_data = {}
-        order_info = {}
-        
         # Process first file to get baseline order
         first_lang = next(iter(js_files))
         first_file = js_files[first_lang]
@@ -152,15 +297,11 @@ def js_to_excel(js_files: Dict[str, str], output_excel_path: str):
             logger.warning(f"{first_lang} flattened data is empty, please check parsing result")
             raise ValueError("Base file flattening resulted in empty data")
         
-        # 创建基准 DataFrame，包含顺序列
-        base_df = pd.DataFrame(first_flattened, columns=['class', 'key', first_lang, 'order'])
-        
-        # 记录每个 class 和 key 的顺序
-        for _, row in base_df.iterrows():
-            class_name = row['class']
-            key = row['key']
-            order = row['order']
-            order_info[(class_name, key)] = order
+        # 以基准文件的条目为行，按 (class, key) 收集各语言的值，保留原始顺序
+        all_rows = {}
+        for class_name, key, value, _ in first_flattened:
+            all_rows[(class_name, key)] = {'class': class_name, 'key': key, first_lang: value}
+        columns = ['class', 'key', first_lang]
         
         # 处理其他语言文件
         for lang, file_path in list(js_files.items())[1:]:
@@ -176,18 +317,15 @@ def js_to_excel(js_files: Dict[str, str], output_excel_path: str):
                 logger.warning(f"{lang} 展平后的数据为空，请检查解析结果")
                 continue
             
-            # 创建当前语言的 DataFrame
-            current_df = pd.DataFrame(flattened_data, columns=['class', 'key', lang, 'order'])
-            
-            # 合并数据
-            base_df = pd.merge(base_df, current_df[['class', 'key', lang]], 
-                             on=['class', 'key'], how='left')
-        
-        # 按照原始顺序排序
-        base_df = base_df.sort_values('order')
+            # 只填充基准文件中已有的条目
+            for class_name, key, value, _ in flattened_data:
+                row = all_rows.get((class_name, key))
+                if row is not None:
+                    row[lang] = value
+            columns.append(lang)
         
-        # 删除顺序列
-        base_df = base_df.drop('order', axis=1)
+        # 一次性构建 DataFrame
+        base_df = pd.DataFrame.from_records(list(all_rows.values()), columns=columns)
             
         # 保存到 Excel
         base_df.to_excel(output_excel_path, index=False)
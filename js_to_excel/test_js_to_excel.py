@@ -0,0 +1,47 @@
+import pytest
+
+import js_to_excel
+
+SAMPLE = (
+    "// header comment\n"
+    "export default {\n"
+    "  text: {\n"
+    "    hi\u00a0: 'v',\n"
+    "    \u3000ok: 'w',\n"
+    "    url: 'http://x.com/a', /* { block } */\n"
+    "    '键-name': \"it\\'s\\nok\",\n"
+    "    num: \u3000 5,\n"
+    "  },\n"
+    "  文本: { deep: { p: '中文 {x}' } },\n"
+    "};\n"
+)
+
+EXPECTED = {
+    'text': {
+        'hi': 'v',
+        'ok': 'w',
+        'url': 'http://x.com/a',
+        '键-name': "it's\nok",
+    },
+    '文本': {'deep': {'p': '中文 {x}'}},
+}
+
+
+@pytest.fixture
+def sample_file(tmp_path):
+    path = tmp_path / 'sample.js'
+    path.write_text(SAMPLE, encoding='utf-8')
+    return str(path)
+
+
+def test_parse_js_file_python_tokenizer(sample_file, monkeypatch):
+    monkeypatch.setattr(js_to_excel, 'HAS_NUMBA', False)
+    assert js_to_excel.parse_js_file(sample_file) == EXPECTED
+
+
+def test_parse_js_file_numba_matches_python(sample_file, monkeypatch):
+    if not js_to_excel.HAS_NUMBA:
+        pytest.skip('numba is not installed')
+    numba_result = js_to_excel.parse_js_file(sample_file)
+    monkeypatch.setattr(js_to_excel, 'HAS_NUMBA', False)
+    assert numba_result == js_to_excel.parse_js_file(sample_file) == EXPECTED
@@ -10,48 +10,24 @@ json_folder = str(Path(__file__).parent / 'json')  # JSON files directory relati
 # Create json folder if it doesn't exist
 os.makedirs(json_folder, exist_ok=True)
 
-# Create an empty DataFrame for storing merged data
-translations_df = pd.DataFrame()
-
-# Read zh_cn.json as baseline
-zh_cn_file_path = os.path.join(json_folder, 'zh_cn.json')
+# Collect translations as {key: {lang: value}} and build the DataFrame once
+merged = {}
+loaded_languages = []  # Languages whose JSON file was read successfully
 zh_cn_keys = []  # Store key order from zh_cn.json
-try:
-    with open(zh_cn_file_path, 'r', encoding='utf-8') as json_file:
-        translations = json.load(json_file)
-        translations_df = pd.DataFrame(list(translations.items()), columns=['key', 'zh_cn'])
-        zh_cn_keys = translations_df['key'].tolist()  # Store key order from zh_cn.json
-except FileNotFoundError:
-    print(f"Warning: {zh_cn_file_path} not found, skipping.")
-    translations_df = pd.DataFrame()  # Initialize empty DataFrame if file not found
-except json.JSONDecodeError as e:
-    print(f"Error decoding JSON from {zh_cn_file_path}: {e}")
-    translations_df = pd.DataFrame()  # Initialize empty DataFrame if parsing error
-except Exception as e:
-    print(f"Unexpected error with {zh_cn_file_path}: {e}")
-
-# Create a set to store all keys
-all_keys = set(translations_df['key'])
-
-# Read other language JSON files and merge
-for lang in languages:
-    if lang == 'zh_cn':
-        continue  # Skip zh_cn as it's already read as baseline
 
+# Read zh_cn.json first as baseline, then the other languages
+for lang in ['zh_cn'] + [lang for lang in languages if lang != 'zh_cn']:
     json_file_path = os.path.join(json_folder, f'{lang}.json')
     
     # Read JSON file
     try:
         with open(json_file_path, 'r', encoding='utf-8') as json_file:
             translations = json.load(json_file)
-            # Convert JSON content to DataFrame and rename columns
-            lang_df = pd.DataFrame(list(translations.items()), columns=['key', lang])
-            
-            # Merge into main DataFrame
-            translations_df = translations_df.merge(lang_df, on='key', how='outer')  # Merge using 'key' as join column
-            
-            # Update all_keys set
-            all_keys.update(translations.keys())
+            for key, value in translations.items():
+                merged.setdefault(key, {})[lang] = value
+            loaded_languages.append(lang)
+            if lang == 'zh_cn':
+                zh_cn_keys = list(translations.keys())  # Store key order from zh_cn.json
 
     except FileNotFoundError:
         print(f"Warning: {json_file_path} not found, skipping.")
@@ -60,29 +36,17 @@ for lang in languages:
     except Exception as e:
         print(f"Unexpected error with {json_file_path}: {e}")
 
-# Handle missing keys
-missing_keys = []
-for key in all_keys:
-    if key not in translations_df['key'].values:
-        # Get values from other language files and fill in
-        row_data = {'key': key, 'zh_cn': None}
-        for lang in languages:
-            if lang != 'zh_cn':
-                # Retrieve translation from respective JSON
-                row_data[lang] = translations.get(key) if key in translations else None
-        missing_keys.append(row_data)
-
-# Add missing keys to final DataFrame
-if missing_keys:
-    missing_df = pd.DataFrame(missing_keys)
-    translations_df = pd.concat([translations_df, missing_df], ignore_index=True)
+# Every key from any language becomes a row; languages lacking a key are left empty
+translations_df = pd.DataFrame.from_dict(merged, orient='index', columns=loaded_languages)
+translations_df = translations_df.rename_axis('key').reset_index()
 
 # Sort by zh_cn.json order, missing keys at the end
-# Create sorting index mapping
-translations_df['sort_order'] = translations_df['key'].apply(lambda x: zh_cn_keys.index(x) if x in zh_cn_keys else len(zh_cn_keys))
+# Create sorting index mapping with a precomputed {key: rank} dict
+zh_cn_rank = {key: i for i, key in enumerate(zh_cn_keys)}
+translations_df['sort_order'] = translations_df['key'].map(zh_cn_rank).fillna(len(zh_cn_keys)).astype('int64')
 
-# Sort by sort_order column
-translations_df = translations_df.sort_values(by='sort_order').drop(columns='sort_order')
+# Sort by sort_order column, keeping keys missing from zh_cn in the order they were read
+translations_df = translations_df.sort_values(by='sort_order', kind='stable').drop(columns='sort_order')
 
 # Save merged DataFrame to Excel file
 output_excel_path = 'translations.xlsx'
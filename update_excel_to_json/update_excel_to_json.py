@@ -2,6 +2,29 @@ import pandas as pd
 import json
 import os
 
+try:
+    # 可选依赖：安装 orjson 后使用更快的 JSON 读写
+    import orjson
+except ImportError:
+    orjson = None
+
+# 读取 JSON 文件
+def load_json(file_path):
+    if orjson is not None:
+        with open(file_path, 'rb') as file:
+            return orjson.loads(file.read())
+    with open(file_path, 'r', encoding='utf-8') as file:
+        return json.load(file)
+
+# 写入 JSON 文件；orjson 只支持 2 空格缩进，未安装 orjson 时保持原有的 4 空格缩进
+def dump_json(data, file_path):
+    if orjson is not None:
+        with open(file_path, 'wb') as file:
+            file.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        return
+    with open(file_path, 'w', encoding='utf-8') as file:
+        json.dump(data, file, ensure_ascii=False, indent=4)
+
 # 读取 Excel 文件
 def read_excel(file_path):
     return pd.read_excel(file_path)
@@ -13,45 +36,49 @@ def update_language_files(data_frame, output_directory):
     # 确保输出目录存在
     os.makedirs(output_directory, exist_ok=True)
 
+    # key 列按名称查找，其余列均为语言列
+    key_i = data_frame.columns.get_loc('key')
+    lang_columns = [(i, lang) for i, lang in enumerate(data_frame.columns) if i != key_i]
+
     # 读取现有的语言文件内容
     language_files = {}
-    for lang in data_frame.columns[1:]:  # 从第二列开始，假设第一列为 key
+    for _, lang in lang_columns:
         lang_file_path = os.path.join(output_directory, f"{lang}.json")
         
         try:
             if os.path.getsize(lang_file_path) > 0:  # 检查文件是否为空
-                with open(lang_file_path, 'r', encoding='utf-8') as file:
-                    language_files[lang] = json.load(file)
+                language_files[lang] = load_json(lang_file_path)
             else:
                 language_files[lang] = {}  # 如果文件为空，初始化为空字典
         except (FileNotFoundError, json.JSONDecodeError) as e:
             print(f"Error reading {lang_file_path}: {e}")
             language_files[lang] = {}  # 如果文件不存在或格式错误，初始化为空字典
 
-    # 读取每一行的数据，更新语言文件中的内容
-    for _, row in data_frame.iterrows():
-        key = row['key']
-        print(f"Processing key: {key}")  # 打印当前处理的 key
-        
-        # 遍历每一列语言的翻译
-        for lang in row.index[1:]:  # 从下一列开始，假设第一列为 key
-            if lang in row and pd.notna(row[lang]):
-                # 更新或新增该语言的翻译内容
-                previous_value = language_files[lang].get(key, None)
-                language_files[lang][key] = row[lang]
-                
-                # 只在内容实际改变时增加更新计数
-                if previous_value != language_files[lang][key]:
-                    updated_count += 1
-                    print(f"Updated {lang} - {key}: {row[lang]}")
-                else:
-                    print(f"No change for {lang} - {key}: {row[lang]} (remains the same)")
+    # 按位置访问每行数据
+    rows = list(data_frame.itertuples(index=False, name=None))
+
+    # 按语言批量更新语言文件中的内容
+    for lang_i, lang in lang_columns:
+        current = language_files[lang]
+
+        # 按行顺序比较，重复的 key 以最后一行为准；与逐行更新一样统计每次实际改变
+        updates = {}
+        changed = 0
+        for row in rows:
+            value = row[lang_i]
+            if pd.notna(value):
+                key = row[key_i]
+                if updates.get(key, current.get(key)) != value:
+                    changed += 1
+                updates[key] = value
+        current.update(updates)
+        updated_count += changed
+        print(f"Updated {lang}: {changed} changed of {len(updates)} entries")
 
     # 写入到每个语言对应的 JSON 文件
     for lang, translations in language_files.items():
         json_file = os.path.join(output_directory, f"{lang}.json")
-        with open(json_file, 'w', encoding='utf-8') as file:
-            json.dump(translations, file, ensure_ascii=False, indent=4)
+        dump_json(translations, json_file)
         print(f"Wrote translations to {json_file}")
 
     # 打印更新的内容